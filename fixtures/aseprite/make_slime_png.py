@@ -5,6 +5,8 @@ Generates a 192x32 RGBA spritesheet with 6 colored frames that line up with
 the metadata in `slime_idle.json`.
 """
 
+import hashlib
+import os
 import struct
 import zlib
 from pathlib import Path
@@ -20,38 +22,72 @@ COLORS = [
     (255, 196, 0, 255),   # attack frame 2
     (120, 144, 156, 255), # hit frame
 ]
+SEED_KEYWORD = b"kestrel-seed"
+
+
+def _build_row() -> bytes:
+    # Solid runs of SEGMENT_WIDTH pixels per frame color, with the last color stretched over
+    # any remaining columns.
+    segments = [bytes(color) * SEGMENT_WIDTH for color in COLORS[:-1]]
+    segments.append(bytes(COLORS[-1]) * WIDTH)
+    pixels = b"".join(segments)[: WIDTH * 4]
+    return b"\x00" + pixels  # PNG filter byte + pixels
+
+
+# Every scanline is identical, so the row is built once at import.
+_ROW = _build_row()
 
 
 def build_rows() -> bytes:
-    rows = []
-    for _ in range(HEIGHT):
-        row = bytearray()
-        for x in range(WIDTH):
-            color_index = min(x // SEGMENT_WIDTH, len(COLORS) - 1)
-            row.extend(COLORS[color_index])
-        rows.append(b"\x00" + bytes(row))  # PNG filter byte + pixels
-    return b"".join(rows)
+    return _ROW * HEIGHT
+
+
+COMPRESSION_LEVEL = 9
+# Identifies the IDAT encoder in the seed digest, so changing the compressor or its level
+# regenerates the file even when the pixels are unchanged. The zlib library version is left
+# out so hosts with different zlib builds don't keep rewriting the fixture.
+ENCODER_ID = f"zlib-level{COMPRESSION_LEVEL}".encode("ascii")
+
+
+def compress_idat(raw: bytes) -> bytes:
+    # Stdlib zlib keeps the fixture generator dependency-free; the ~24 KiB payload is a
+    # handful of repeated runs and deflates in well under a millisecond.
+    return zlib.compress(raw, COMPRESSION_LEVEL)
+
+
+# CRC covers tag + data; the payload is checksummed seeded with the precomputed tag CRC
+# instead of concatenating the two.
+_TAG_CRC = {tag: zlib.crc32(tag) for tag in (b"IHDR", b"tEXt", b"IDAT", b"IEND")}
 
 
 def chunk(tag: bytes, data: bytes) -> bytes:
-    return (
-        struct.pack(">I", len(data))
-        + tag
-        + data
-        + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
-    )
+    crc = zlib.crc32(data, _TAG_CRC[tag]) & 0xFFFFFFFF
+    return b"".join((struct.pack(">I", len(data)), tag, data, struct.pack(">I", crc)))
 
 
-def generate_png(path: Path) -> None:
+def generate_png(path: Path) -> bool:
+    """Write the spritesheet to `path`; returns False when the file was already up to date."""
     raw = build_rows()
-    png = b"\x89PNG\r\n\x1a\n"
-    png += chunk(b"IHDR", struct.pack(">IIBBBBB", WIDTH, HEIGHT, 8, 6, 0, 0, 0))
-    png += chunk(b"IDAT", zlib.compress(raw, 9))
-    png += chunk(b"IEND", b"")
-    path.write_bytes(png)
+    ihdr = struct.pack(">IIBBBBB", WIDTH, HEIGHT, 8, 6, 0, 0, 0)
+    # The seed digest sits in a tEXt chunk right after IHDR, so an up-to-date file can be
+    # recognized from its first few dozen bytes without compressing anything.
+    digest = hashlib.blake2b(ENCODER_ID + ihdr + raw, digest_size=8).hexdigest().encode("ascii")
+    header = b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", ihdr) + chunk(b"tEXt", SEED_KEYWORD + b"\x00" + digest)
+    if path.exists():
+        with path.open("rb") as handle:
+            if handle.read(len(header)) == header:
+                return False
+    # Write to a sibling temp file and swap it in, so an interrupted write can never leave a
+    # truncated PNG behind that still carries a matching header.
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(b"".join((header, chunk(b"IDAT", compress_idat(raw)), chunk(b"IEND", b""))))
+    os.replace(tmp, path)
+    return True
 
 
 if __name__ == "__main__":
     output = Path(__file__).with_name("slime.png")
-    generate_png(output)
-    print(f"Wrote placeholder spritesheet to {output}")
+    if generate_png(output):
+        print(f"Wrote placeholder spritesheet to {output}")
+    else:
+        print(f"Placeholder spritesheet already up to date: {output}")
@@ -11,21 +11,28 @@ Typical usage:
 from __future__ import annotations
 
 import argparse
+import contextlib
 import datetime as dt
 import json
 import os
-import re
 import shlex
+import shutil
 import subprocess
 import sys
+import threading
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from sprite_bench import head_commit
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 PERF_DIR = REPO_ROOT / "perf"
 SPRITE_BENCH = REPO_ROOT / "scripts" / "sprite_bench.py"
+# Separate cargo target dir for the profile build when running alongside the sprite bench.
+PARALLEL_PROFILE_TARGET_DIR = REPO_ROOT / "target" / "capture_profile"
 
-PROFILE_CMD = [
+PROFILE_BUILD_CMD = [
     "cargo",
     "test",
     "--release",
@@ -33,46 +40,65 @@ PROFILE_CMD = [
     "anim_stats",
     "--test",
     "animation_profile",
+]
+PROFILE_TEST_ARGS = [
     "animation_profile_snapshot",
-    "--",
     "--ignored",
     "--exact",
     "--nocapture",
 ]
-
-STEP_STATS_RE = re.compile(
-    r"\[animation_profile\] sys_drive per-step stats: "
-    r"mean=(?P<mean>[0-9.]+) ms p95=(?P<p95>[0-9.]+) ms max=(?P<max>[0-9.]+) ms "
-    r"steady_mean=(?P<steady>[0-9.]+) ms steady_samples=(?P<steady_samples>\d+) "
-    r"spike_mean=(?P<spike>[0-9.]+) ms spike_samples=(?P<spike_samples>\d+)"
-)
-
-SPRITE_TOTALS_RE = re.compile(
-    r"\[animation_profile\] anim_stats sprite totals: "
-    r"fast_loop=(?P<fast_loop>\d+) event=(?P<event>\d+) plain=(?P<plain>\d+) "
-    r"bsearch=(?P<bsearch>\d+) fast_bucket=(?P<fast_bucket>\d+) "
-    r"general_bucket=(?P<general_bucket>\d+) applies=(?P<applies>\d+)"
-)
-
-SPRITE_BUCKET_AVG_RE = re.compile(
-    r"\[animation_profile\] anim_stats sprite bucket avg: "
-    r"fast=(?P<fast>[0-9.]+) entities/frame general=(?P<general>[0-9.]+) entities/frame"
-)
-
-TOP_STEP_RE = re.compile(
-    r"\[animation_profile\]\s+step\s+(?P<index>\d+)\s+->\s+(?P<value>[0-9.]+) ms"
-)
-
-TOP_MIX_RE = re.compile(
-    r"\[animation_profile\]\s+step\s+(?P<index>\d+)\s+->\s+(?P<value>[0-9.]+) ms \| "
-    r"sprite\(fast=(?P<fast>\d+) event=(?P<event>\d+) plain=(?P<plain>\d+) "
-    r"bsearch=(?P<bsearch>\d+) fast_bucket=(?P<fast_bucket>\d+) "
-    r"general_bucket=(?P<general_bucket>\d+) applies=(?P<applies>\d+)\) "
-    r"transform\(adv=(?P<adv>\d+) zero=(?P<zero>\d+) skipped=(?P<skipped>\d+) "
-    r"loop_resume=(?P<loop_resume>\d+) zero_duration=(?P<zero_duration>\d+) "
-    r"fast=(?P<fast_path>\d+) slow=(?P<slow_path>\d+)\) "
-    r"time_ns\(adv=(?P<adv_ns>\d+) sample=(?P<sample_ns>\d+) apply=(?P<apply_ns>\d+)\)"
-)
+# Equivalent single cargo invocation, recorded in the capture summary.
+PROFILE_CMD = [*PROFILE_BUILD_CMD, PROFILE_TEST_ARGS[0], "--", *PROFILE_TEST_ARGS[1:]]
+
+READ_CHUNK_BYTES = 1 << 16
+ERROR_TAIL_BYTES = 4096
+
+PROFILE_PREFIX = b"[animation_profile]"
+
+STEP_STATS_TAG = b" sys_drive per-step stats:"
+SPRITE_TOTALS_TAG = b" anim_stats sprite totals:"
+SPRITE_BUCKET_AVG_TAG = b" anim_stats sprite bucket avg:"
+# Separates a top step from its per-step mix: "step <index> -> <value> ms | sprite(...) ...".
+TOP_MIX_SEPARATOR = b"| "
+
+# (log key, summary key) pairs, in the order they are emitted by the harness.
+STEP_STATS_FIELDS = [
+    ("mean", "mean"),
+    ("p95", "p95"),
+    ("max", "max"),
+    ("steady_mean", "steady"),
+    ("steady_samples", "steady_samples"),
+    ("spike_mean", "spike"),
+    ("spike_samples", "spike_samples"),
+]
+SPRITE_TOTALS_FIELDS = ["fast_loop", "event", "plain", "bsearch", "fast_bucket", "general_bucket", "applies"]
+SPRITE_BUCKET_AVG_FIELDS = ["fast", "general"]
+
+# (section, log key, summary key) triples for the per-step mix, in harness order. The
+# sections reuse key names (fast, adv), so fields are looked up per section.
+TOP_MIX_FIELDS = [
+    (b"sprite", "fast", "fast"),
+    (b"sprite", "event", "event"),
+    (b"sprite", "plain", "plain"),
+    (b"sprite", "bsearch", "bsearch"),
+    (b"sprite", "fast_bucket", "fast_bucket"),
+    (b"sprite", "general_bucket", "general_bucket"),
+    (b"sprite", "applies", "applies"),
+    (b"sprite", "flush_calls", "flush_calls"),
+    (b"sprite", "flushed", "flushed"),
+    (b"sprite", "queue_drains", "queue_drains"),
+    (b"sprite", "queue_len", "queue_len"),
+    (b"transform", "adv", "adv"),
+    (b"transform", "zero", "zero"),
+    (b"transform", "skipped", "skipped"),
+    (b"transform", "loop_resume", "loop_resume"),
+    (b"transform", "zero_duration", "zero_duration"),
+    (b"transform", "fast", "fast_path"),
+    (b"transform", "slow", "slow_path"),
+    (b"time_ns", "adv", "adv_ns"),
+    (b"time_ns", "sample", "sample_ns"),
+    (b"time_ns", "apply", "apply_ns"),
+]
 
 
 def parse_args(argv: Sequence[str]) -> argparse.Namespace:
@@ -90,6 +116,15 @@ def parse_args(argv: Sequence[str]) -> argparse.Namespace:
     parser.add_argument("--profile-extra", default="", help="Extra args appended after `--` for the anim_stats harness")
     parser.add_argument("--skip-bench", action="store_true", help="Skip the sprite benchmark step")
     parser.add_argument("--skip-profile", action="store_true", help="Skip the anim_stats profiling step")
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help=(
+            "Run the sprite bench and anim_stats profile concurrently (each cargo build gets half the cores). "
+            "The bench is measured while the profile builds and runs, so its timings are noisier; "
+            "don't use it for baselines."
+        ),
+    )
     parser.add_argument(
         "--python-cmd",
         default=sys.executable or "python",
@@ -98,36 +133,98 @@ def parse_args(argv: Sequence[str]) -> argparse.Namespace:
     return parser.parse_args(argv)
 
 
-def run_subprocess(cmd: Sequence[str], *, env: Dict[str, str]) -> str:
-    proc = subprocess.run(
+class ChildProcesses:
+    """Tracks the children launched by each capture stage so a failed --parallel stage can stop
+    its sibling instead of waiting minutes for it to finish."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._live: Set[subprocess.Popen] = set()
+        self._stopped = False
+
+    @contextlib.contextmanager
+    def launch(self, cmd: Sequence[str], **kwargs: object) -> Iterator[subprocess.Popen]:
+        with self._lock:
+            if self._stopped:
+                raise RuntimeError(f"Not launching {' '.join(cmd)}: another capture stage failed")
+            proc = subprocess.Popen(cmd, cwd=REPO_ROOT, **kwargs)
+            self._live.add(proc)
+        try:
+            with proc:
+                yield proc
+        finally:
+            with self._lock:
+                self._live.discard(proc)
+
+    def stop_all(self) -> None:
+        # Only direct children are killed; a sprite_bench.py cargo grandchild may still finish in
+        # the background, but the failure is reported right away.
+        with self._lock:
+            self._stopped = True
+            for proc in self._live:
+                if proc.poll() is None:
+                    proc.kill()
+
+
+CHILDREN = ChildProcesses()
+
+
+def run_checked(cmd: Sequence[str], *, env: Dict[str, str], stdout: Optional[int] = None) -> Optional[bytes]:
+    with CHILDREN.launch(cmd, env=env, stdout=stdout) as proc:
+        output, _ = proc.communicate()
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, list(cmd), output)
+    return output
+
+
+def run_subprocess(
+    cmd: Sequence[str],
+    *,
+    env: Dict[str, str],
+    log_path: Path,
+    on_chunk: Optional[Callable[[bytes], None]] = None,
+) -> None:
+    # Merge stderr into stdout so the log keeps the original interleaving, and tee each raw
+    # chunk into the log and the parser so the full output is never held in memory.
+    tail = b""
+    with CHILDREN.launch(
         cmd,
-        cwd=REPO_ROOT,
         env=env,
-        text=True,
-        capture_output=True,
-        check=False,
-    )
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        bufsize=1 << 20,
+    ) as proc, log_path.open("wb") as log_file:
+        while True:
+            chunk = proc.stdout.read(READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            log_file.write(chunk)
+            if on_chunk is not None:
+                on_chunk(chunk)
+            tail = (tail + chunk)[-ERROR_TAIL_BYTES:]
     if proc.returncode != 0:
         raise RuntimeError(
-            f"Command {' '.join(cmd)} failed with exit code {proc.returncode}:\n{proc.stdout}\n{proc.stderr}"
+            f"Command {' '.join(cmd)} failed with exit code {proc.returncode} (full log: {log_path}):\n"
+            f"{tail.decode('utf-8', errors='replace')}"
         )
-    if proc.stderr:
-        # Preserve stderr alongside stdout for debugging; append to stdout so it's in the log too.
-        return proc.stdout + ("\n" + proc.stderr if proc.stderr else "")
-    return proc.stdout
 
 
 def ensure_perf_dir() -> None:
     PERF_DIR.mkdir(exist_ok=True)
 
 
+def env_overrides(args: argparse.Namespace) -> Dict[str, str]:
+    return {
+        "ANIMATION_PROFILE_COUNT": str(args.count),
+        "ANIMATION_PROFILE_STEPS": str(args.steps),
+        "ANIMATION_PROFILE_WARMUP": str(args.warmup),
+        "ANIMATION_PROFILE_DT": f"{args.dt:.9f}",
+    }
+
+
 def build_env(args: argparse.Namespace) -> Dict[str, str]:
-    env = os.environ.copy()
-    env["ANIMATION_PROFILE_COUNT"] = str(args.count)
-    env["ANIMATION_PROFILE_STEPS"] = str(args.steps)
-    env["ANIMATION_PROFILE_WARMUP"] = str(args.warmup)
-    env["ANIMATION_PROFILE_DT"] = f"{args.dt:.9f}"
-    return env
+    # Built once in main() and shared by every child launch.
+    return {**os.environ, **env_overrides(args)}
 
 
 def run_sprite_bench(args: argparse.Namespace, env: Dict[str, str]) -> List[str]:
@@ -154,85 +251,178 @@ def run_sprite_bench(args: argparse.Namespace, env: Dict[str, str]) -> List[str]
     base_args.extend(["--warmup", str(args.warmup)])
     base_args.extend(["--dt", f"{args.dt:.9f}"])
 
-    last_err: Optional[Exception] = None
-    for candidate in python_candidates:
-        cmd: List[str] = [candidate, str(SPRITE_BENCH), *base_args]
-        try:
-            subprocess.run(cmd, cwd=REPO_ROOT, env=env, check=True)
-            return cmd
-        except OSError as err:
-            last_err = err
-        except subprocess.CalledProcessError:
-            raise
-
-    raise RuntimeError(
-        f"Failed to invoke {SPRITE_BENCH} with python executables {python_candidates}: {last_err}"
-    )
-
-
-def parse_profile_output(stdout: str) -> Dict[str, object]:
-    data: Dict[str, object] = {}
-    match = STEP_STATS_RE.search(stdout)
-    if match:
-        data["per_step_stats"] = {k: float(v) if "samples" not in k else int(v) for k, v in match.groupdict().items()}
-    match = SPRITE_TOTALS_RE.search(stdout)
-    if match:
-        data["sprite_totals"] = {k: int(v) for k, v in match.groupdict().items()}
-    match = SPRITE_BUCKET_AVG_RE.search(stdout)
-    if match:
-        data["sprite_bucket_avg"] = {k: float(v) for k, v in match.groupdict().items()}
-
-    top_steps: List[Dict[str, float]] = []
-    for m in TOP_STEP_RE.finditer(stdout):
-        index = int(m.group("index"))
-        value = float(m.group("value"))
-        top_steps.append({"step": index, "ms": value})
-    if top_steps:
-        data["top_steps"] = top_steps
-
-    top_mix: List[Dict[str, object]] = []
-    for m in TOP_MIX_RE.finditer(stdout):
-        entry = {"step": int(m.group("index")), "ms": float(m.group("value"))}
-        for key in [
-            "fast",
-            "event",
-            "plain",
-            "bsearch",
-            "fast_bucket",
-            "general_bucket",
-            "applies",
-            "adv",
-            "zero",
-            "skipped",
-            "loop_resume",
-            "zero_duration",
-            "fast_path",
-            "slow_path",
-        ]:
-            entry[key] = int(m.group(key))
-        for key in ["adv_ns", "sample_ns", "apply_ns"]:
-            entry[key] = int(m.group(key))
-        top_mix.append(entry)
-    if top_mix:
-        data["top_step_mix"] = top_mix
-    return data
+    # Resolve on PATH up front rather than probing each candidate with a failed exec.
+    resolved = next(filter(None, (shutil.which(candidate) for candidate in python_candidates)), None)
+    if resolved is None:
+        raise RuntimeError(f"Failed to locate a python executable for {SPRITE_BENCH} among {python_candidates}")
+
+    cmd: List[str] = [resolved, str(SPRITE_BENCH), *base_args]
+    run_checked(cmd, env=env)
+    return cmd
+
+
+def parse_fields(text: bytes) -> Dict[str, bytes]:
+    fields: Dict[str, bytes] = {}
+    for token in text.split():
+        key, sep, value = token.partition(b"=")
+        if sep:
+            fields[key.decode("ascii", errors="replace")] = value
+    return fields
+
+
+def parse_top_mix(step: int, ms: float, mix: bytes) -> Optional[Dict[str, object]]:
+    """Parse the `sprite(...) transform(...) time_ns(...)` tail of a top-step-mix line.
+
+    >>> line = (
+    ...     b"sprite(fast=1 event=2 plain=3 bsearch=4 fast_bucket=5 general_bucket=6 applies=7 "
+    ...     b"flush_calls=8 flushed=9 queue_drains=10 queue_len=11) transform(adv=12 zero=13 "
+    ...     b"skipped=14 loop_resume=15 zero_duration=16 fast=17 slow=18) "
+    ...     b"time_ns(adv=19 sample=20 apply=21)"
+    ... )
+    >>> entry = parse_top_mix(42, 0.5, line)
+    >>> [entry[key] for key in ("step", "fast", "queue_len", "fast_path", "adv", "adv_ns", "apply_ns")]
+    [42, 1, 11, 17, 12, 19, 21]
+    """
+    sections: Dict[bytes, Dict[str, bytes]] = {}
+    for section in mix.strip().rstrip(b")").split(b") "):
+        name, _, inner = section.partition(b"(")
+        sections[name] = parse_fields(inner)
+    entry: Dict[str, object] = {"step": step, "ms": ms}
+    for section, key, name in TOP_MIX_FIELDS:
+        value = sections.get(section, {}).get(key)
+        if value is None:
+            return None
+        entry[name] = int(value)
+    return entry
+
+
+class ProfileParser:
+    """Incremental parser for the anim_stats harness output.
+
+    Chunks are split into lines as they arrive; only a trailing partial line is carried over
+    between feeds. Lines without the harness prefix are skipped, the rest are dispatched on the
+    fixed text that follows it. Only the nested top-step-mix lines go through a regex.
+    """
+
+    def __init__(self) -> None:
+        self.data: Dict[str, object] = {}
+        self.top_steps: List[Dict[str, float]] = []
+        self.top_mix: List[Dict[str, object]] = []
+        self._pending = b""
+
+    def feed(self, chunk: bytes) -> None:
+        lines = (self._pending + chunk).split(b"\n")
+        self._pending = lines.pop()
+        for line in lines:
+            self.parse_line(line)
+
+    def parse_line(self, line: bytes) -> None:
+        start = line.find(PROFILE_PREFIX)
+        if start < 0:
+            return
+        data = self.data
+        body = line[start + len(PROFILE_PREFIX) :]
+        if body.startswith(STEP_STATS_TAG):
+            fields = parse_fields(body)
+            if "per_step_stats" not in data and all(key in fields for key, _ in STEP_STATS_FIELDS):
+                data["per_step_stats"] = {
+                    name: int(fields[key]) if "samples" in name else float(fields[key])
+                    for key, name in STEP_STATS_FIELDS
+                }
+        elif body.startswith(SPRITE_TOTALS_TAG):
+            fields = parse_fields(body)
+            if "sprite_totals" not in data and all(key in fields for key in SPRITE_TOTALS_FIELDS):
+                data["sprite_totals"] = {key: int(fields[key]) for key in SPRITE_TOTALS_FIELDS}
+        elif body.startswith(SPRITE_BUCKET_AVG_TAG):
+            fields = parse_fields(body)
+            if "sprite_bucket_avg" not in data and all(key in fields for key in SPRITE_BUCKET_AVG_FIELDS):
+                data["sprite_bucket_avg"] = {key: float(fields[key]) for key in SPRITE_BUCKET_AVG_FIELDS}
+        else:
+            # "  step <index> -> <value> ms", optionally followed by the per-step mix.
+            parts = body.split(None, 5)
+            if len(parts) < 5 or parts[0] != b"step" or parts[2] != b"->" or parts[4] != b"ms":
+                return
+            step, ms = int(parts[1]), float(parts[3])
+            self.top_steps.append({"step": step, "ms": ms})
+            if len(parts) == 6 and parts[5].startswith(TOP_MIX_SEPARATOR):
+                entry = parse_top_mix(step, ms, parts[5][len(TOP_MIX_SEPARATOR) :])
+                if entry is not None:
+                    self.top_mix.append(entry)
+
+    def finish(self) -> Dict[str, object]:
+        if self._pending:
+            self.parse_line(self._pending)
+            self._pending = b""
+        data = dict(self.data)
+        if self.top_steps:
+            data["top_steps"] = self.top_steps
+        if self.top_mix:
+            data["top_step_mix"] = self.top_mix
+        return data
+
+
+def parse_profile_output(stdout: bytes) -> Dict[str, object]:
+    parser = ProfileParser()
+    parser.feed(stdout)
+    return parser.finish()
+
+
+def build_test_executable(build_cmd: Sequence[str], *, env: Dict[str, str], target: str) -> str:
+    # `--no-run` compiles without executing; cargo reports each artefact as one JSON message
+    # per line on stdout while rendered diagnostics and progress stay on stderr.
+    cmd = [*build_cmd, "--no-run", "--message-format=json-render-diagnostics"]
+    stdout = run_checked(cmd, env=env, stdout=subprocess.PIPE) or b""
+    executable: Optional[str] = None
+    for line in stdout.splitlines():
+        if not line.startswith(b"{"):
+            continue
+        message = json.loads(line)
+        if message.get("reason") != "compiler-artifact" or not message.get("executable"):
+            continue
+        if message.get("target", {}).get("name") == target:
+            executable = message["executable"]
+    if executable is None:
+        raise RuntimeError(f"Command {' '.join(cmd)} did not report a test executable for {target}")
+    return executable
 
 
 def run_animation_profile(args: argparse.Namespace, env: Dict[str, str]) -> Dict[str, object]:
-    cmd = PROFILE_CMD.copy()
+    # Build first and run the test binary directly, so cargo's compile output stays out of the
+    # profile log and the measured run doesn't pay for another dependency-graph resolution.
+    executable = build_test_executable(PROFILE_BUILD_CMD, env=env, target="animation_profile")
+    cmd = [executable, *PROFILE_TEST_ARGS]
     if args.profile_extra:
         extra = shlex.split(args.profile_extra)
         if extra:
             cmd.extend(extra)
-    stdout = run_subprocess(cmd, env=env)
     log_path = PERF_DIR / f"{args.label}_profile.log"
-    log_path.write_text(stdout, encoding="utf-8")
+    parser = ProfileParser()
+    run_subprocess(cmd, env=env, log_path=log_path, on_chunk=parser.feed)
 
-    parsed = parse_profile_output(stdout)
+    parsed = parser.finish()
     parsed["log"] = log_path.name
     return parsed
 
 
+def run_parallel(args: argparse.Namespace, env: Dict[str, str]) -> Tuple[List[str], Dict[str, object]]:
+    jobs = str(max(1, (os.cpu_count() or 2) // 2))
+    bench_env = {**env, "CARGO_BUILD_JOBS": jobs}
+    # The bench keeps the default target dir because sprite_bench.py reads its report from
+    # there; the profile build moves aside so the two cargo runs don't wait on one build lock.
+    profile_env = {**env, "CARGO_BUILD_JOBS": jobs, "CARGO_TARGET_DIR": str(PARALLEL_PROFILE_TARGET_DIR)}
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        bench_future = pool.submit(run_sprite_bench, args, bench_env)
+        profile_future = pool.submit(run_animation_profile, args, profile_env)
+        # Surface the first failure as soon as it happens rather than after the sibling stage.
+        done, _ = wait([bench_future, profile_future], return_when=FIRST_EXCEPTION)
+        for future in done:
+            error = future.exception()
+            if error is not None:
+                CHILDREN.stop_all()
+                raise error
+        return bench_future.result(), profile_future.result()
+
+
 def main(argv: Sequence[str]) -> int:
     args = parse_args(argv)
     if args.skip_bench and args.skip_profile:
@@ -241,23 +431,20 @@ def main(argv: Sequence[str]) -> int:
     ensure_perf_dir()
     env = build_env(args)
     timestamp = dt.datetime.now().isoformat(timespec="seconds")
-    commit = (
-        subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT)
-        .decode("utf-8")
-        .strip()
-    )
 
     env_summary = {k: env[k] for k in sorted(env) if k.startswith("ANIMATION_PROFILE_")}
 
     bench_cmd: Optional[List[str]] = None
-    if not args.skip_bench:
-        bench_cmd = run_sprite_bench(args, env)
-
     profile_data: Optional[Dict[str, object]] = None
-    if not args.skip_profile:
-        profile_data = run_animation_profile(args, env)
+    if args.parallel and not args.skip_bench and not args.skip_profile:
+        bench_cmd, profile_data = run_parallel(args, env)
+    else:
+        if not args.skip_bench:
+            bench_cmd = run_sprite_bench(args, env)
+        if not args.skip_profile:
+            profile_data = run_animation_profile(args, env)
 
-    summary: Dict[str, object] = {"label": args.label, "timestamp": timestamp, "commit": commit}
+    summary: Dict[str, object] = {"label": args.label, "timestamp": timestamp, "commit": head_commit()}
     if bench_cmd is not None:
         summary["sprite_bench"] = {"runs": args.runs, "command": " ".join(bench_cmd), "env": env_summary}
     else:
@@ -272,7 +459,8 @@ def main(argv: Sequence[str]) -> int:
         summary["animation_profile"] = None
 
     json_path = PERF_DIR / f"{args.label}_capture.json"
-    json_path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    with json_path.open("w", encoding="utf-8") as handle:
+        json.dump(summary, handle, indent=2)
     print(f"[capture] wrote {json_path}")
     if profile_data is not None:
         print(f"[capture] profile stats: {profile_data.get('per_step_stats', {})}")
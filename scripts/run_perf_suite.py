@@ -63,8 +63,8 @@ def shell_join(parts: List[str]) -> str:
 
 
 def load_json(path: Path) -> Dict[str, object]:
-    with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+    # json.loads detects the UTF encoding of raw bytes, skipping the text-mode reader.
+    return json.loads(path.read_bytes())
 
 
 def run_sprite_bench(args: argparse.Namespace) -> Dict[str, object]:
@@ -182,7 +182,8 @@ def main() -> int:
         "capture_sprite_perf": capture_result,
     }
     suite_path = PERF_DIR / f"{args.label}_suite.json"
-    suite_path.write_text(json.dumps(suite_summary, indent=2), encoding="utf-8")
+    with suite_path.open("w", encoding="utf-8") as handle:
+        json.dump(suite_summary, handle, indent=2)
     print(f"[perf_suite] wrote {suite_path.relative_to(REPO_ROOT)}")
     return 0
 
@@ -11,18 +11,28 @@ from __future__ import annotations
 
 import argparse
 import datetime
+import functools
+import itertools
 import json
+import math
 import os
 import shlex
-import statistics as stats
 import subprocess
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 DEFAULT_REPORT = REPO_ROOT / "target" / "animation_targets_report.json"
 PERF_DIR = REPO_ROOT / "perf"
+DEFAULT_TEST_ARGS = ("--ignored", "--nocapture")
+DEFAULT_TEST_ARGS_STR = " ".join(DEFAULT_TEST_ARGS)
+# Bytes of a failed run's log echoed to the terminal, so CI failures stay diagnosable.
+ERROR_TAIL_BYTES = 4096
+
+
+def build_env(overrides: Dict[str, str]) -> Dict[str, str]:
+    return {**os.environ, **overrides}
 
 
 def build_command(args: argparse.Namespace) -> List[str]:
@@ -35,21 +45,94 @@ def build_command(args: argparse.Namespace) -> List[str]:
     if args.features:
         cmd.extend(["--features", args.features])
     cmd.append(args.test)
-    extra = shlex.split(args.test_args) if args.test_args else []
+    if args.test_args == DEFAULT_TEST_ARGS_STR:
+        extra: Sequence[str] = DEFAULT_TEST_ARGS
+    else:
+        extra = shlex.split(args.test_args) if args.test_args else []
     if extra:
         cmd.append("--")
         cmd.extend(extra)
     return cmd
 
 
-def run_once(cmd: List[str], env: Dict[str, str]) -> None:
-    subprocess.run(cmd, check=True, cwd=REPO_ROOT, env=env)
+def report_failed_run(log_path: Path) -> None:
+    with log_path.open("rb") as log_file:
+        log_file.seek(0, os.SEEK_END)
+        log_file.seek(max(0, log_file.tell() - ERROR_TAIL_BYTES))
+        tail = log_file.read()
+    print(f"[sprite_bench] run failed (full log: {log_path}):\n{tail.decode('utf-8', errors='replace')}")
+
+
+def run_once(cmd: List[str], env: Dict[str, str], log_path: Optional[Path] = None) -> None:
+    if log_path is None:
+        subprocess.run(cmd, check=True, cwd=REPO_ROOT, env=env)
+        return
+    # Keep cargo's output off the terminal between measured runs so tty writes don't throttle it.
+    with log_path.open("wb") as log_file:
+        try:
+            subprocess.run(cmd, check=True, cwd=REPO_ROOT, env=env, stdout=log_file, stderr=subprocess.STDOUT)
+        except subprocess.CalledProcessError:
+            report_failed_run(log_path)
+            raise
+
+
+def parallel_slot_envs(env: Dict[str, str], workers: int) -> List[Dict[str, str]]:
+    # Each concurrent harness builds into its own target dir so the cargo invocations don't queue
+    # on a single build lock, and writes its report there via ANIMATION_TARGETS_REPORT. Built once
+    # per bench and reused by every batch.
+    slot_envs = []
+    for slot in range(workers):
+        slot_dir = REPO_ROOT / "target" / f"bench_{slot}"
+        report_path = slot_dir / "animation_targets_report.json"
+        slot_envs.append(dict(env, CARGO_TARGET_DIR=str(slot_dir), ANIMATION_TARGETS_REPORT=str(report_path)))
+    return slot_envs
+
+
+def run_parallel(
+    harness_argv: Sequence[str], slot_envs: List[Dict[str, str]], log_paths: List[Optional[Path]]
+) -> List[Path]:
+    """Launch one harness per entry in `log_paths` concurrently and return their report paths."""
+    procs: List[subprocess.Popen] = []
+    log_files = []
+    try:
+        for slot_env, log_path in zip(slot_envs, log_paths):
+            stdout = None
+            if log_path is not None:
+                stdout = log_path.open("wb")
+                log_files.append(stdout)
+            # No preexec_fn/new session, so CPython can still use vfork for the launch (cwd rules
+            # out posix_spawn).
+            procs.append(
+                subprocess.Popen(
+                    harness_argv,
+                    cwd=REPO_ROOT,
+                    env=slot_env,
+                    stdout=stdout,
+                    stderr=subprocess.STDOUT if stdout is not None else None,
+                )
+            )
+        for proc, log_path in zip(procs, log_paths):
+            if proc.wait() != 0:
+                if log_path is not None:
+                    report_failed_run(log_path)
+                raise subprocess.CalledProcessError(proc.returncode, list(harness_argv))
+    finally:
+        for proc in procs:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+        for log_file in log_files:
+            log_file.close()
+    return [Path(slot_env["ANIMATION_TARGETS_REPORT"]) for slot_env in slot_envs[: len(log_paths)]]
 
 
 def read_report(report_path: Path) -> Tuple[Dict[str, object], List[dict]]:
-    if not report_path.exists():
-        raise FileNotFoundError(f"Benchmark report not found: {report_path}")
-    payload = json.loads(report_path.read_text(encoding="utf-8"))
+    # One open+read instead of stat+read; json.loads detects the encoding of raw bytes itself.
+    try:
+        data = report_path.read_bytes()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Benchmark report not found: {report_path}") from None
+    payload = json.loads(data)
     if isinstance(payload, dict):
         metadata = payload.get("metadata", {})
         cases = payload.get("cases", [])
@@ -59,10 +142,34 @@ def read_report(report_path: Path) -> Tuple[Dict[str, object], List[dict]]:
     return metadata, cases
 
 
+def new_case_slot(entry: dict) -> Dict[str, object]:
+    return {
+        "units": entry.get("units"),
+        "count": entry.get("count"),
+        "budget": entry.get("budget_ms"),
+        "steps": entry.get("steps"),
+        "samples": entry.get("samples"),
+        "runs": [],
+        # Welford running mean / sum of squared deviations over "runs".
+        "mean": 0.0,
+        "m2": 0.0,
+    }
+
+
+def record_run(slot: Dict[str, object], value: float) -> None:
+    runs: List[float] = slot["runs"]
+    runs.append(value)
+    delta = value - slot["mean"]
+    slot["mean"] += delta / len(runs)
+    slot["m2"] += delta * (value - slot["mean"])
+
+
 def load_baseline(path: Path) -> Tuple[Dict[str, float], Dict[str, object]]:
-    if not path.exists():
-        raise FileNotFoundError(f"Baseline summary not found: {path}")
-    payload = json.loads(path.read_text(encoding="utf-8"))
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Baseline summary not found: {path}") from None
+    payload = json.loads(data)
     mapping = {entry["label"]: entry.get("mean_ms", 0.0) for entry in payload.get("systems", [])}
     meta = {
         "path": str(path),
@@ -73,7 +180,26 @@ def load_baseline(path: Path) -> Tuple[Dict[str, float], Dict[str, object]]:
     return mapping, meta
 
 
-def git_rev() -> str:
+def read_head_commit(repo: Path) -> str:
+    # Resolve HEAD from the .git directory with plain file reads; packed refs and linked
+    # worktrees (where .git is a file) surface as OSError and fall back to git itself.
+    head = (repo / ".git" / "HEAD").read_text(encoding="utf-8").strip()
+    if head.startswith("ref: "):
+        return (repo / ".git" / head[len("ref: ") :]).read_text(encoding="utf-8").strip()
+    return head
+
+
+@functools.lru_cache(maxsize=None)
+def head_commit() -> str:
+    # GIT_COMMIT wins so every artefact of one capture (including capture_sprite_perf.py's
+    # summary, which shares this helper) records the same commit.
+    commit = os.environ.get("GIT_COMMIT", "").strip()
+    if commit:
+        return commit
+    try:
+        return read_head_commit(REPO_ROOT)
+    except OSError:
+        pass
     return (
         subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT)
         .decode("utf-8")
@@ -90,87 +216,162 @@ def parse_args(argv: List[str]) -> argparse.Namespace:
     parser.add_argument("--test", default="animation_targets_measure", help="Test target to invoke")
     parser.add_argument(
         "--test-args",
-        default="--ignored --nocapture",
+        default=DEFAULT_TEST_ARGS_STR,
         help="Arguments passed after `--` to the cargo test invocation",
     )
-    parser.add_argument("--report-path", default=str(DEFAULT_REPORT), help="Path to animation_targets_report.json")
+    parser.add_argument(
+        "--report-path", type=Path, default=DEFAULT_REPORT, help="Path to animation_targets_report.json"
+    )
     parser.add_argument("--count", type=int, default=10_000, help="ANIMATION_PROFILE_COUNT value")
     parser.add_argument("--steps", type=int, default=240, help="ANIMATION_PROFILE_STEPS value")
     parser.add_argument("--warmup", type=int, default=16, help="ANIMATION_PROFILE_WARMUP value")
     parser.add_argument("--dt", type=float, default=1.0 / 60.0, help="ANIMATION_PROFILE_DT value")
     parser.add_argument("--baseline", default="", help="Optional JSON summary to diff against")
-    return parser.parse_args(argv)
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Stream cargo output to the terminal instead of perf/<label>.run<N>.log",
+    )
+    parser.add_argument("--no-text", action="store_true", help="Only write perf/<label>.json (skip the .txt table)")
+    parser.add_argument(
+        "--parallel-runs",
+        type=int,
+        default=1,
+        help="Run up to K harness invocations at once, each building into its own target/bench_<slot> dir",
+    )
+    args = parser.parse_args(argv)
+    if args.parallel_runs > 1 and args.report_path != DEFAULT_REPORT:
+        # Parallel slots each write their own report under target/bench_<slot>/.
+        parser.error("--report-path cannot be combined with --parallel-runs > 1")
+    return args
 
 
 def format_table(rows: List[List[str]]) -> str:
     if not rows:
         return ""
-    widths = [0] * len(rows[0])
-    for row in rows:
-        for idx, cell in enumerate(row):
-            widths[idx] = max(widths[idx], len(cell))
-    formatted = []
-    for row in rows:
-        padded = "  ".join(cell.rjust(widths[idx]) for idx, cell in enumerate(row))
-        formatted.append(padded)
-    return "\n".join(formatted)
+    # Column-wise reductions run in C via zip_longest/map instead of a per-cell Python loop;
+    # zip_longest keeps trailing columns when a case is missing from some runs (ragged rows).
+    widths = [max(map(len, column)) for column in itertools.zip_longest(*rows, fillvalue="")]
+    return "\n".join("  ".join(cell.rjust(width) for cell, width in zip(row, widths)) for row in rows)
+
+
+def format_summary_text(
+    args: argparse.Namespace,
+    timestamp: str,
+    commit: str,
+    cmd_str: str,
+    env_lines: List[str],
+    baseline_meta: Optional[Dict[str, object]],
+    bench_meta: Optional[Dict[str, object]],
+    rows: List[List[str]],
+) -> str:
+    summary_lines = [
+        f"Sprite benchmark summary: {args.label}",
+        f"Timestamp: {timestamp}",
+        f"Commit: {commit}",
+        f"Command: {cmd_str}",
+        "Environment:",
+    ]
+    summary_lines.extend(f"  - {line}" for line in env_lines)
+    if baseline_meta:
+        summary_lines.append(
+            "Baseline: {label} (commit {commit}) @ {path} [{timestamp}]".format(
+                label=baseline_meta.get("label") or "n/a",
+                commit=baseline_meta.get("commit") or "n/a",
+                path=baseline_meta.get("path") or args.baseline,
+                timestamp=baseline_meta.get("timestamp") or "n/a",
+            )
+        )
+    if bench_meta:
+        summary_lines.append("Animation targets metadata:")
+        for key in (
+            "warmup_frames",
+            "measured_frames",
+            "samples_per_case",
+            "dt",
+            "profile",
+            "lto_mode",
+            "target_cpu",
+            "rustc_version",
+        ):
+            if key in bench_meta:
+                summary_lines.append(f"  - {key}: {bench_meta[key]}")
+    summary_lines.append("")
+    summary_lines.append("Per-run mean_step_ms (ms):")
+    summary_lines.append(format_table(rows))
+    return "\n".join(summary_lines) + "\n"
 
 
 def main(argv: List[str]) -> int:
     args = parse_args(argv)
     PERF_DIR.mkdir(exist_ok=True)
 
-    env = os.environ.copy()
-    env["PROFILE"] = args.profile
-    env["CARGO_PROFILE"] = args.profile
-    env["ANIMATION_PROFILE_COUNT"] = str(args.count)
-    env["ANIMATION_PROFILE_STEPS"] = str(args.steps)
-    env["ANIMATION_PROFILE_WARMUP"] = str(args.warmup)
-    env["ANIMATION_PROFILE_DT"] = f"{args.dt:.9f}"
+    # Built once and shared by every harness launch.
+    env = build_env(
+        {
+            "PROFILE": args.profile,
+            "CARGO_PROFILE": args.profile,
+            "ANIMATION_PROFILE_COUNT": str(args.count),
+            "ANIMATION_PROFILE_STEPS": str(args.steps),
+            "ANIMATION_PROFILE_WARMUP": str(args.warmup),
+            "ANIMATION_PROFILE_DT": f"{args.dt:.9f}",
+        }
+    )
 
     cmd = build_command(args)
+    cmd_str = " ".join(cmd)
     baseline_map: Dict[str, float] = {}
     baseline_meta: Optional[Dict[str, object]] = None
     has_baseline = bool(args.baseline)
     if has_baseline:
         baseline_path = Path(args.baseline)
         baseline_map, baseline_meta = load_baseline(baseline_path)
-    report_path = Path(args.report_path)
     cases: Dict[str, Dict[str, object]] = {}
 
-    print(f"[sprite_bench] running {args.runs} iteration(s): {' '.join(cmd)}")
+    print(f"[sprite_bench] running {args.runs} iteration(s): {cmd_str}")
     bench_meta: Optional[Dict[str, object]] = None
-    for idx in range(1, args.runs + 1):
-        print(f"[sprite_bench] run {idx}/{args.runs}")
-        run_once(cmd, env)
-        meta, report_entries = read_report(report_path)
-        if meta and bench_meta is None:
-            bench_meta = meta
-        for entry in report_entries:
-            label = entry["label"]
-            slot = cases.setdefault(
-                label,
-                {
-                    "units": entry.get("units"),
-                    "count": entry.get("count"),
-                    "budget": entry.get("budget_ms"),
-                    "steps": entry.get("steps"),
-                    "samples": entry.get("samples"),
-                    "runs": [],
-                },
-            )
-            slot["runs"].append(entry["summary"]["mean_step_ms"])
+    workers = max(1, min(args.parallel_runs, args.runs))
+    harness_argv = tuple(cmd)
+    slot_envs = parallel_slot_envs(env, workers) if workers > 1 else []
+    for first in range(1, args.runs + 1, workers):
+        batch = list(range(first, min(first + workers, args.runs + 1)))
+        log_paths = [None if args.verbose else PERF_DIR / f"{args.label}.run{idx}.log" for idx in batch]
+        if workers == 1:
+            print(f"[sprite_bench] run {first}/{args.runs}")
+            run_once(cmd, env, log_paths[0])
+            batch_reports = [args.report_path]
+        else:
+            if len(batch) == 1:
+                # A trailing single-run batch still uses slot 0 and its already-built target dir.
+                print(f"[sprite_bench] run {first}/{args.runs}")
+            else:
+                print(f"[sprite_bench] runs {batch[0]}-{batch[-1]}/{args.runs} in parallel")
+            batch_reports = run_parallel(harness_argv, slot_envs, log_paths)
+        for batch_report in batch_reports:
+            meta, report_entries = read_report(batch_report)
+            if meta and bench_meta is None:
+                bench_meta = meta
+            for entry in report_entries:
+                label = entry["label"]
+                slot = cases.get(label)
+                if slot is None:
+                    # Per-case metadata is identical across runs; capture it on first sight only.
+                    slot = cases[label] = new_case_slot(entry)
+                record_run(slot, entry["summary"]["mean_step_ms"])
 
     timestamp = datetime.datetime.now().isoformat(timespec="seconds")
-    commit = git_rev()
+    commit = head_commit()
     env_keys = sorted(k for k in env if k.startswith("ANIMATION_PROFILE_"))
     env_lines = [f"{key}={env[key]}" for key in env_keys]
 
-    header = ["system"] + [f"run{i}" for i in range(1, args.runs + 1)] + ["mean", "stddev"]
-    if has_baseline:
-        header.append("delta")
-    header.append("budget")
-    rows = [header]
+    # The text table is only built when the .txt summary is wanted.
+    rows: Optional[List[List[str]]] = None
+    if not args.no_text:
+        header = ["system"] + [f"run{i}" for i in range(1, args.runs + 1)] + ["mean", "stddev"]
+        if has_baseline:
+            header.append("delta")
+        header.append("budget")
+        rows = [header]
     summary_payload = {
         "label": args.label,
         "timestamp": timestamp,
@@ -186,23 +387,20 @@ def main(argv: List[str]) -> int:
     for label in sorted(cases.keys()):
         slot = cases[label]
         values: List[float] = slot["runs"]
-        mean_val = stats.mean(values)
-        std_val = stats.pstdev(values) if len(values) > 1 else 0.0
+        mean_val = slot["mean"]
+        std_val = math.sqrt(slot["m2"] / len(values)) if len(values) > 1 else 0.0
         budget = slot["budget"]
-        delta_cell = ""
         delta_payload: Optional[float] = None
         if has_baseline:
             baseline_mean = baseline_map.get(label)
-            if baseline_mean is None:
-                delta_cell = "n/a"
-            else:
+            if baseline_mean is not None:
                 delta_payload = mean_val - baseline_mean
-                delta_cell = f"{delta_payload:+.3f}"
-        row = [label] + [f"{v:.3f}" for v in values] + [f"{mean_val:.3f}", f"{std_val:.3f}"]
-        if has_baseline:
-            row.append(delta_cell if delta_cell else "n/a")
-        row.append(f"{budget:.3f}")
-        rows.append(row)
+        if rows is not None:
+            row = [label] + [f"{v:.3f}" for v in values] + [f"{mean_val:.3f}", f"{std_val:.3f}"]
+            if has_baseline:
+                row.append("n/a" if delta_payload is None else f"{delta_payload:+.3f}")
+            row.append(f"{budget:.3f}")
+            rows.append(row)
         entry_payload = {
             "label": label,
             "units": slot["units"],
@@ -216,47 +414,16 @@ def main(argv: List[str]) -> int:
             entry_payload["delta_vs_baseline_ms"] = delta_payload
         summary_payload["systems"].append(entry_payload)
 
-    summary_lines = [
-        f"Sprite benchmark summary: {args.label}",
-        f"Timestamp: {timestamp}",
-        f"Commit: {commit}",
-        f"Command: {' '.join(cmd)}",
-        "Environment:",
-    ]
-    summary_lines.extend(f"  - {line}" for line in env_lines)
-    if has_baseline and baseline_meta:
-        summary_lines.append(
-            "Baseline: {label} (commit {commit}) @ {path} [{timestamp}]".format(
-                label=baseline_meta.get("label") or "n/a",
-                commit=baseline_meta.get("commit") or "n/a",
-                path=baseline_meta.get("path") or args.baseline,
-                timestamp=baseline_meta.get("timestamp") or "n/a",
-            )
-        )
-    if bench_meta:
-        summary_lines.append("Animation targets metadata:")
-        for key in (
-            "warmup_frames",
-            "measured_frames",
-            "samples_per_case",
-            "dt",
-            "profile",
-            "lto_mode",
-            "target_cpu",
-            "rustc_version",
-        ):
-            if key in bench_meta:
-                summary_lines.append(f"  - {key}: {bench_meta[key]}")
-    summary_lines.append("")
-    summary_lines.append("Per-run mean_step_ms (ms):")
-    summary_lines.append(format_table(rows))
-    summary_text = "\n".join(summary_lines) + "\n"
-
-    text_path = PERF_DIR / f"{args.label}.txt"
     json_path = PERF_DIR / f"{args.label}.json"
-    text_path.write_text(summary_text, encoding="utf-8")
-    json_path.write_text(json.dumps(summary_payload, indent=2), encoding="utf-8")
-    print(f"[sprite_bench] wrote {text_path}")
+    if rows is not None:
+        text_path = PERF_DIR / f"{args.label}.txt"
+        summary_text = format_summary_text(
+            args, timestamp, commit, cmd_str, env_lines, baseline_meta if has_baseline else None, bench_meta, rows
+        )
+        text_path.write_text(summary_text, encoding="utf-8")
+        print(f"[sprite_bench] wrote {text_path}")
+    with json_path.open("w", encoding="utf-8") as handle:
+        json.dump(summary_payload, handle, indent=2)
     print(f"[sprite_bench] wrote {json_path}")
     return 0
 
@@ -564,7 +564,7 @@ fn write_report(report: &BenchReport) -> std::io::Result<()> {
     if report.cases.is_empty() {
         return Ok(());
     }
-    let path = target_dir();
+    let path = report_path();
     if let Some(parent) = path.as_path().parent() {
         create_dir_all(parent)?;
     }
@@ -575,14 +575,18 @@ fn write_report(report: &BenchReport) -> std::io::Result<()> {
     Ok(())
 }
 
-fn target_dir() -> PathBuf {
-    let mut dir = if let Ok(raw) = std::env::var("CARGO_TARGET_DIR") {
+fn report_path() -> PathBuf {
+    // sprite_bench.py --parallel-runs points each concurrent harness at its own report file.
+    if let Ok(raw) = std::env::var("ANIMATION_TARGETS_REPORT") {
+        return PathBuf::from(raw);
+    }
+    let mut path = if let Ok(raw) = std::env::var("CARGO_TARGET_DIR") {
         PathBuf::from(raw)
     } else {
         PathBuf::from("target")
     };
-    dir.push("animation_targets_report.json");
-    dir
+    path.push("animation_targets_report.json");
+    path
 }
 
 fn seed_sprite_animators(world: &mut EcsWorld, count: usize, randomize_phase: bool) {